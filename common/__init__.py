@@ -0,0 +1 @@
+# 共用模組: RSS 偵測、Sheets 紀錄、Gemini 分析與 LINE 推播
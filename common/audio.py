@@ -0,0 +1,65 @@
+import os
+import time
+import atexit
+import tempfile
+
+from .config import COOKIES_CONTENT
+
+# Cookies 整個 process 只寫一次暫存檔，結束時清掉 (可重入、可平行下載)
+_cookie_path = None
+
+def _get_cookie_file():
+    global _cookie_path
+    if not COOKIES_CONTENT:
+        return None
+    if _cookie_path is None:
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)
+        tmp.write(COOKIES_CONTENT)
+        tmp.close()
+        _cookie_path = tmp.name
+        atexit.register(os.unlink, _cookie_path)
+    return _cookie_path
+
+def download_audio(video_link, output_filename="temp_audio"):
+    """使用 yt-dlp 下載音訊 (iOS 偽裝模式，Cookies 為選用)"""
+    import yt_dlp  # 延遲載入 (沒有新影片時不用付 import 成本)
+
+    print(f"   Downloading audio from {video_link}...")
+
+    # 設定 yt-dlp 參數
+    ydl_opts = {
+        # 直接抓原始音訊容器，不經 ffmpeg 重新編碼 (Gemini 可直接吃 m4a/webm)
+        'format': 'bestaudio[ext=m4a]/bestaudio',
+        # 關鍵修正 1: 強制使用 iOS 客戶端 (繞過 IP 封鎖與 n-challenge)
+        'extractor_args': {
+            'youtube': {
+                'player_client': ['ios']
+            }
+        },
+        'outtmpl': f"{output_filename}.%(ext)s",
+        'quiet': True,
+        # 有提供 YOUTUBE_COOKIES 才帶 cookies (共用暫存檔，不落在 CWD)
+        'cookiefile': _get_cookie_file(),
+        # 關鍵修正 3: 忽略憑證與非致命錯誤
+        'nocheckcertificate': True,
+        'ignoreerrors': True,
+    }
+
+    # YouTube 偶發 429 限流，指數退避重試，避免影片被誤判失敗而漏掉
+    delay = 2
+    for attempt in range(4):
+        if attempt:
+            print(f"   Retrying in {delay}s... ({attempt}/3)")
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([video_link])
+
+            for ext in ('m4a', 'webm', 'opus', 'mp3'):
+                final_file = f"{output_filename}.{ext}"
+                if os.path.exists(final_file):
+                    return final_file
+        except Exception as e:
+            print(f"   Download failed: {e}")
+    return None
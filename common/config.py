@@ -0,0 +1,37 @@
+import os
+import json
+import requests
+
+# --- Configuration ---
+CHANNEL_IDS_RAW = os.getenv("YOUTUBE_CHANNEL_ID", "")
+CHANNEL_IDS = [x.strip() for x in CHANNEL_IDS_RAW.split(",") if x.strip()]
+SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
+GEMINI_KEY = os.getenv("GEMINI_API_KEY")
+LINE_TOKEN = os.getenv("LINE_ACCESS_TOKEN")
+LINE_USER_ID = os.getenv("LINE_USER_ID")
+
+# 新增: 讀取 Cookies Secret
+COOKIES_CONTENT = os.getenv("YOUTUBE_COOKIES")
+
+try:
+    key_str = os.getenv("GCP_SA_KEY")
+    GCP_SA_KEY = json.loads(key_str) if key_str else None
+except Exception as e:
+    GCP_SA_KEY = None
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+# LINE 單則訊息上限
+LINE_MSG_LIMIT = 4000
+
+# 共用連線池 (keep-alive，避免每次呼叫重新 TLS 握手)
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+SYSTEM_PROMPT = """
+你是一位精通聖經與教會信息的助理。你將會收到一段教會聚會的錄音檔。
+請仔細聆聽內容並進行分析（若音質不佳請盡量辨識）。
+請給我最新信息的重點，劉奎元和李俊輝弟兄分享的重點，及能夠幫助聖徒進入經歷分享的突破點，
+對應的經文請附在相關的段落，並列出經文本文。以及可供反思的三個問題。
+格式要求：使用清晰的 Markdown 標題與條列式。
+"""
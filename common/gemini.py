@@ -0,0 +1,81 @@
+import time
+
+from .config import GEMINI_KEY, SYSTEM_PROMPT, LINE_MSG_LIMIT
+
+# 輸出反正會被截到 LINE 上限，限制輸出 token 數以控管成本與延遲
+_GEN_CONFIG = {"max_output_tokens": 4096}
+
+# 快取: Gemini 模型 (SYSTEM_PROMPT 固定，整個 process 只建一次)
+# 注: explicit context cache 的最低門檻是 32k token，這段 prompt 遠遠不及，
+# 不做註定失敗的 CachedContent.create
+_gemini_model = None
+
+def _get_model():
+    import google.generativeai as genai
+
+    global _gemini_model
+    if _gemini_model is None:
+        _gemini_model = genai.GenerativeModel(
+            'gemini-1.5-flash', system_instruction=SYSTEM_PROMPT)
+    return _gemini_model
+
+# 快取: 本次執行已上傳的音檔 (key: video id)，重試時免重新上傳
+_uploaded_files = {}
+
+def _upload_audio(audio_path, video_id=None):
+    """上傳音檔到 Gemini 並等待處理完成；同一支影片重複呼叫時直接重用"""
+    import google.generativeai as genai
+
+    if video_id and video_id in _uploaded_files:
+        try:
+            audio_file = genai.get_file(_uploaded_files[video_id])
+            if audio_file.state.name in ("PROCESSING", "ACTIVE"):
+                print("   Reusing uploaded audio...")
+            else:
+                audio_file = None
+        except Exception:
+            audio_file = None
+    else:
+        audio_file = None
+
+    if audio_file is None:
+        print("   Uploading to Gemini...")
+        audio_file = genai.upload_file(path=audio_path)
+        if video_id:
+            _uploaded_files[video_id] = audio_file.name
+
+    # 指數退避輪詢 (處理可能長達數十秒，固定短間隔只是白打 API)
+    delay = 0.5
+    while audio_file.state.name == "PROCESSING":
+        print("   Processing audio file...")
+        time.sleep(delay)
+        delay = min(delay * 1.5, 8)
+        audio_file = genai.get_file(audio_file.name)
+
+    if audio_file.state.name == "FAILED":
+        raise ValueError("Audio processing failed in Gemini.")
+    return audio_file
+
+def analyze_audio_with_gemini(audio_path, video_id=None):
+    # 延遲載入 (沒有新影片時不用付 import 成本)
+    import google.generativeai as genai
+
+    genai.configure(api_key=GEMINI_KEY)
+
+    audio_file = _upload_audio(audio_path, video_id)
+
+    print("   Generating content...")
+    response = _get_model().generate_content(
+        [audio_file], generation_config=_GEN_CONFIG, stream=True)
+
+    # 串流接收，累積到 LINE 上限就提前停止 (訊息反正會被截斷)
+    parts = []
+    total = 0
+    for chunk in response:
+        # 安全截斷/MAX_TOKENS 結尾的 chunk 沒有 parts，碰 .text 會丟 ValueError
+        if not chunk.parts: continue
+        parts.append(chunk.text)
+        total += len(chunk.text)
+        if total >= LINE_MSG_LIMIT: break
+
+    return "".join(parts)
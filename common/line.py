@@ -0,0 +1,7 @@
+from .config import SESSION, LINE_TOKEN, LINE_USER_ID, LINE_MSG_LIMIT
+
+def send_line_message(message):
+    url = "https://api.line.me/v2/bot/message/push"
+    headers = {"Authorization": f"Bearer {LINE_TOKEN}"}
+    payload = {"to": LINE_USER_ID, "messages": [{"type": "text", "text": message[:LINE_MSG_LIMIT]}]}
+    SESSION.post(url, headers=headers, json=payload, timeout=10)
@@ -0,0 +1,66 @@
+import json
+import xml.etree.ElementTree as ET
+
+from .config import SESSION
+
+# YouTube Atom feed 的 namespace
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+
+# 各頻道 feed 的 ETag / Last-Modified，跨次執行存在本機
+# (CI 上由 actions/cache 還原；見 .github/workflows/checker.yml)
+STATE_FILE = "state.json"
+
+def _load_feed_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def save_feed_state():
+    try:
+        with open(STATE_FILE, "w") as f:
+            json.dump(_feed_state, f)
+    except Exception as e:
+        print(f"State save error: {e}")
+
+_feed_state = _load_feed_state()
+
+# 本次抓到但還沒確認處理完的驗證資訊；commit_feed_state 通過後才生效，
+# 失敗的頻道保留舊 ETag，下次執行不會被 304 跳過
+_pending_state = {}
+
+def commit_feed_state(channel_id):
+    """頻道的最新影片處理完 (或本來就處理過) 後才更新驗證資訊"""
+    if channel_id in _pending_state:
+        _feed_state[channel_id] = _pending_state.pop(channel_id)
+
+def get_latest_video(channel_id):
+    rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+    try:
+        # 條件式 GET: feed 沒變時 YouTube 回 304，省掉整包下載與解析
+        headers = {}
+        prev = _feed_state.get(channel_id, {})
+        if prev.get("etag"): headers["If-None-Match"] = prev["etag"]
+        if prev.get("modified"): headers["If-Modified-Since"] = prev["modified"]
+
+        resp = SESSION.get(rss_url, headers=headers, timeout=10)
+        if resp.status_code != 200:
+            # 304 = 沒更新；其他 (500/403...) 視同暫時失敗，都不動舊驗證資訊
+            return None
+
+        root = ET.fromstring(resp.content)
+        _pending_state[channel_id] = {
+            "etag": resp.headers.get("ETag"),
+            "modified": resp.headers.get("Last-Modified")
+        }
+        entry = root.find(f"{_ATOM}entry")
+        if entry is None: return None
+        return {
+            "id": entry.findtext(f"{_YT}videoId"),
+            "title": entry.findtext(f"{_ATOM}title"),
+            "link": entry.find(f"{_ATOM}link").get("href"),
+            "channel_title": root.findtext(f"{_ATOM}title")
+        }
+    except: return None
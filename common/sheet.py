@@ -0,0 +1,61 @@
+import json
+
+from .config import GCP_SA_KEY, SHEET_ID, SCOPE
+
+# 快取: gspread 連線、試算表與已處理 ID 集合 (整個執行過程只建立一次)
+_gs_client = None
+_gs_sheet = None
+_processed_ids = None
+
+# 已處理 ID 的本機快照: ID 欄會無上限成長，快照在手時免整欄讀回，
+# 只有快照不存在 (冷啟動) 才向試算表對帳一次
+# (CI 上由 actions/cache 還原；見 .github/workflows/checker.yml)
+IDS_FILE = "processed_ids.json"
+
+def _load_id_snapshot():
+    try:
+        with open(IDS_FILE) as f:
+            return set(json.load(f))
+    except Exception:
+        return None
+
+def _save_id_snapshot():
+    if _processed_ids is None: return
+    try:
+        with open(IDS_FILE, "w") as f:
+            json.dump(sorted(_processed_ids), f)
+    except Exception as e:
+        print(f"Snapshot save error: {e}")
+
+def get_sheet():
+    global _gs_client, _gs_sheet
+    if not GCP_SA_KEY or not SHEET_ID: return None
+    if _gs_sheet is None:
+        import gspread  # 延遲載入 (沒有新影片時不用付 import 成本)
+        _gs_client = gspread.service_account_from_dict(GCP_SA_KEY, scopes=SCOPE)
+        _gs_sheet = _gs_client.open_by_key(SHEET_ID).sheet1
+    return _gs_sheet
+
+def check_if_processed(video_id):
+    global _processed_ids
+    try:
+        if _processed_ids is None:
+            _processed_ids = _load_id_snapshot()
+        if _processed_ids is None:
+            sheet = get_sheet()
+            if sheet is None: return False
+            _processed_ids = set(sheet.col_values(1))
+            _save_id_snapshot()
+        return video_id in _processed_ids
+    except: return False
+
+def mark_processed(video_id):
+    """寫入快取，讓同一次執行內不會重複處理"""
+    if _processed_ids is not None:
+        _processed_ids.add(video_id)
+
+def append_rows(rows):
+    sheet = get_sheet()
+    if sheet:
+        sheet.append_rows(rows, value_input_option="RAW")
+        _save_id_snapshot()